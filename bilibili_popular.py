@@ -1,16 +1,117 @@
 import requests
-import re
+from requests.adapters import HTTPAdapter
 import json
 import csv
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Callable, Iterable, TextIO
 import os
+from collections import Counter
+from functools import lru_cache
+
+# 并发获取视频详情的最大线程数
+MAX_WORKERS = 16
+
+# 所有线程合计每秒最多发出的请求数
+MAX_REQUESTS_PER_SECOND = 10
+
+# 对限流和服务端错误的重试次数、退避基数（秒）及需要重试的状态码
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# 热门列表和详情接口中 stat 字段的统计项及其对应的导出字段名
+STAT_FIELDS = {
+    'view': 'play_count',
+    'danmaku': 'danmaku_count',
+    'like': 'like_count',
+    'coin': 'coin_count',
+    'favorite': 'favorite_count',
+    'share': 'share_count',
+    'reply': 'reply_count'
+}
+
+# 视频信息中除统计项外需要保留的字段
+INFO_FIELDS = ('duration', 'pubdate', 'cid', 'tname')
+
+# 视频详情本地缓存文件及有效期（秒）
+CACHE_FILE = '.bili_cache.json'
+CACHE_TTL = 3600
+
+# 逐行导出JSON时复用同一个编码器，避免 json.dumps 每次调用都重新构造
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+# CSV导出的字段
+CSV_EXPORT_FIELDS = [
+    'rank', 'title', 'owner_name', 'play_count', 'danmaku_count',
+    'like_count', 'coin_count', 'favorite_count', 'share_count',
+    'reply_count', 'duration_formatted', 'publish_time', 'bvid',
+    'pub_location', 'tname'
+]
+
+
+class _RateLimiter:
+    """线程安全的限速器，保证相邻两次请求的间隔不小于 1/max_rate 秒"""
+
+    def __init__(self, max_rate: float):
+        self.interval = 1.0 / max_rate
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+
+    def wait(self):
+        """阻塞到当前线程可以发出下一次请求"""
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _optional_int(value: Any) -> Optional[int]:
+    """将统计值转换为整数，缺失时保留None以区别于真实的0"""
+    return None if value is None else int(value)
+
+
+# 报告和终端输出中相同的数值会反复出现，缓存格式化结果
+@lru_cache(maxsize=4096)
+def format_duration(seconds: int) -> str:
+    """格式化视频时长"""
+    if seconds == 0:
+        return 'N/A'
+
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+
+    if hours > 0:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    else:
+        return f"{minutes}:{seconds:02d}"
+
+
+@lru_cache(maxsize=4096)
+def format_number(number: Any) -> str:
+    """格式化数字显示"""
+    if number == 'N/A' or number is None:
+        return 'N/A'
+    try:
+        return format(int(number), ',')
+    except:
+        return str(number)
 
 
 class BilibiliPopularVideoAnalyzer:
     def __init__(self):
         self.session = requests.Session()
+
+        # 连接池需容纳所有并发线程，以便复用长连接；重试在 _request 中处理，以便每次重试也受限速约束
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS)
+        self.session.mount('https://', adapter)
+        self.rate_limiter = _RateLimiter(MAX_REQUESTS_PER_SECOND)
+
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:143.0) Gecko/20100101 Firefox/143.0',
             'Referer': 'https://www.bilibili.com/'
@@ -25,6 +126,34 @@ class BilibiliPopularVideoAnalyzer:
         except Exception as e:
             print(f"⚠️  警告: 无法读取cookie文件 ({e})，部分功能可能受限")
 
+        # 加载本地详情缓存，重复运行时无需再次请求
+        self.details_cache = self._load_cache()
+        self.cache_dirty = False
+
+    def _request(self, url: str, timeout: int) -> requests.Response:
+        """
+        按全局速率限制发送GET请求
+
+        遇到限流、服务端错误或连接失败时指数退避重试（优先遵循Retry-After），
+        每次重试同样先经过限速器，保证所有线程合计不超过 MAX_REQUESTS_PER_SECOND。
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            self.rate_limiter.wait()
+            try:
+                response = self.session.get(url, headers=self.headers, timeout=timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == MAX_RETRIES:
+                    raise
+                time.sleep(RETRY_BACKOFF * 2 ** attempt)
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+
+            retry_after = response.headers.get('Retry-After', '')
+            response.close()
+            time.sleep(int(retry_after) if retry_after.isdigit() else RETRY_BACKOFF * 2 ** attempt)
+
     def get_user_input(self):
         """
         交互式获取用户输入
@@ -94,41 +223,65 @@ class BilibiliPopularVideoAnalyzer:
         Returns:
             List[Dict]: 热门视频信息列表
         """
+        if max_pages < 1:
+            return []
+
         all_videos = []
+        page = page_number
+        end_page = page_number + max_pages
+        batch_size = 1
 
-        for page in range(page_number, page_number + max_pages):
-            print(f"📄 正在获取第 {page} 页热门视频...")
+        # 先单独请求一页，之后每批页数翻倍（不超过 MAX_WORKERS），并发获取后按页码顺序合并；
+        # 某页失败、为空或接口标记 no_more 时停止，越过最后一页的请求最多与已获取的页数相当
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, max_pages)) as executor:
+            while page < end_page:
+                pages = range(page, min(page + batch_size, end_page))
+                results = list(executor.map(lambda p: self._get_popular_page(page_size, p), pages))
 
-            url = f'https://api.bilibili.com/x/web-interface/popular?ps={page_size}&pn={page}'
+                for current, data in zip(pages, results):
+                    if data is None:
+                        return all_videos
 
-            try:
-                response = self.session.get(url, headers=self.headers, timeout=15)
-                response.raise_for_status()
-                data = response.json()
+                    videos = data.get('list')
+                    if not videos:
+                        print(f"ℹ️  第 {current} 页没有更多视频")
+                        return all_videos
 
-                if data['code'] != 0:
-                    print(f"❌ 第 {page} 页API返回错误: {data['message']}")
-                    break
+                    all_videos.extend(videos)
+                    print(f"✅ 第 {current} 页获取成功，共 {len(videos)} 个视频")
 
-                videos = data['data']['list']
-                if not videos:
-                    print(f"ℹ️  第 {page} 页没有更多视频")
-                    break
+                    if data.get('no_more'):
+                        print(f"ℹ️  第 {current} 页已是最后一页")
+                        return all_videos
 
-                all_videos.extend(videos)
-                print(f"✅ 第 {page} 页获取成功，共 {len(videos)} 个视频")
+                page = pages.stop
+                batch_size = min(batch_size * 2, MAX_WORKERS)
 
-                # 添加延迟避免请求过快
-                time.sleep(1)
+        return all_videos
 
-            except requests.exceptions.RequestException as e:
-                print(f"❌ 获取第 {page} 页失败: {e}")
-                break
-            except Exception as e:
-                print(f"❌ 解析第 {page} 页数据时出错: {e}")
-                break
+    def _get_popular_page(self, page_size: int, page: int) -> Optional[Dict[str, Any]]:
+        """获取单页热门视频，返回接口的data部分（含list和no_more），失败时返回None"""
+        print(f"📄 正在获取第 {page} 页热门视频...")
 
-        return all_videos
+        url = f'https://api.bilibili.com/x/web-interface/popular?ps={page_size}&pn={page}'
+
+        try:
+            response = self._request(url, timeout=15)
+            response.raise_for_status()
+            data = response.json()
+
+            if data['code'] != 0:
+                print(f"❌ 第 {page} 页API返回错误: {data['message']}")
+                return None
+
+            return data['data']
+
+        except requests.exceptions.RequestException as e:
+            print(f"❌ 获取第 {page} 页失败: {e}")
+            return None
+        except Exception as e:
+            print(f"❌ 解析第 {page} 页数据时出错: {e}")
+            return None
 
     def get_video_details(self, bvid: str) -> Dict[str, Any]:
         """
@@ -140,72 +293,50 @@ class BilibiliPopularVideoAnalyzer:
         Returns:
             Dict: 视频详细数据
         """
-        # 方法1: 通过网页抓取
-        stats = self._get_video_stats_from_web(bvid)
-
-        # 方法2: 通过API获取更多数据
-        api_data = self._get_video_stats_from_api(bvid)
-
-        return {**stats, **api_data}
-
-    def _get_video_stats_from_web(self, bvid: str) -> Dict[str, str]:
-        """从网页获取视频统计数据"""
-        url = f'https://www.bilibili.com/video/{bvid}'
-
+        entry = self.details_cache.get(bvid)
+        if entry and time.time() - entry['cached_at'] < CACHE_TTL:
+            return entry['data']
+
+        details = self._get_video_stats_from_api(bvid)
+        if details:
+            self.details_cache[bvid] = {'cached_at': time.time(), 'data': details}
+            self.cache_dirty = True
+        return details
+
+    def _load_cache(self) -> Dict[str, Any]:
+        """读取本地详情缓存，丢弃已过期的条目"""
         try:
-            response = self.session.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-
-            # 更健壮的正则表达式匹配
-            patterns = [
-                r"视频播放量 (\d+[,]?\d*)、弹幕量 (\d+[,]?\d*)、点赞数 (\d+[,]?\d*)、投硬币枚数 (\d+[,]?\d*)、收藏人数 (\d+[,]?\d*)、转发人数 (\d+[,]?\d*)",
-                r"播放量 (\d+[,]?\d*).*弹幕量 (\d+[,]?\d*).*点赞数 (\d+[,]?\d*).*投硬币枚数 (\d+[,]?\d*).*收藏人数 (\d+[,]?\d*).*转发人数 (\d+[,]?\d*)"
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, response.text)
-                if match:
-                    return {
-                        'play_count': match.group(1).replace(',', ''),
-                        'danmaku_count': match.group(2).replace(',', ''),
-                        'like_count': match.group(3).replace(',', ''),
-                        'coin_count': match.group(4).replace(',', ''),
-                        'favorite_count': match.group(5).replace(',', ''),
-                        'share_count': match.group(6).replace(',', '')
-                    }
-
-            return {key: 'N/A' for key in ['play_count', 'danmaku_count', 'like_count',
-                                           'coin_count', 'favorite_count', 'share_count']}
+            if os.path.exists(CACHE_FILE):
+                with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+                now = time.time()
+                return {bvid: entry for bvid, entry in cache.items() if now - entry['cached_at'] < CACHE_TTL}
+        except Exception as e:
+            print(f"⚠️  警告: 无法读取缓存文件 ({e})，将重新获取数据")
+        return {}
 
+    def _save_cache(self):
+        """保存详情缓存到本地，没有新条目时不写文件"""
+        if not self.cache_dirty:
+            return
+        try:
+            with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump(self.details_cache, f, ensure_ascii=False)
+            self.cache_dirty = False
         except Exception as e:
-            print(f"❌ 从网页获取视频数据失败 {bvid}: {e}")
-            return {key: 'N/A' for key in ['play_count', 'danmaku_count', 'like_count',
-                                           'coin_count', 'favorite_count', 'share_count']}
+            print(f"⚠️  警告: 无法写入缓存文件 ({e})")
 
     def _get_video_stats_from_api(self, bvid: str) -> Dict[str, Any]:
         """通过API获取视频统计数据"""
         url = f'https://api.bilibili.com/x/web-interface/view?bvid={bvid}'
 
         try:
-            response = self.session.get(url, headers=self.headers, timeout=10)
+            response = self._request(url, timeout=10)
             response.raise_for_status()
             data = response.json()
 
             if data['code'] == 0:
-                stat = data['data']['stat']
-                return {
-                    'view': stat.get('view', 0),
-                    'danmaku': stat.get('danmaku', 0),
-                    'like': stat.get('like', 0),
-                    'coin': stat.get('coin', 0),
-                    'favorite': stat.get('favorite', 0),
-                    'share': stat.get('share', 0),
-                    'reply': stat.get('reply', 0),
-                    'duration': data['data'].get('duration', 0),
-                    'pubdate': data['data'].get('pubdate', 0),
-                    'cid': data['data'].get('cid', 0),
-                    'tname': data['data'].get('tname', '')  # 分区名称
-                }
+                return self._parse_video_stats(data['data'])
             else:
                 return {}
 
@@ -213,18 +344,25 @@ class BilibiliPopularVideoAnalyzer:
             print(f"❌ 从API获取视频数据失败 {bvid}: {e}")
             return {}
 
-    def format_duration(self, seconds: int) -> str:
-        """格式化视频时长"""
-        if seconds == 0:
-            return 'N/A'
-
-        minutes, seconds = divmod(seconds, 60)
-        hours, minutes = divmod(minutes, 60)
+    def _parse_video_stats(self, info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        从视频信息中提取统计数据（热门列表与详情接口的结构相同）
 
-        if hours > 0:
-            return f"{hours}:{minutes:02d}:{seconds:02d}"
-        else:
-            return f"{minutes}:{seconds:02d}"
+        只包含实际存在的字段，缺失的字段由调用方按缺失处理，避免与真实的0混淆
+        """
+        stat = info.get('stat') or {}
+        details = {key: stat[field] for field, key in STAT_FIELDS.items() if field in stat}
+        details.update((field, info[field]) for field in INFO_FIELDS if field in info)
+        return details
+
+    def _resolve_video_details(self, video: Dict[str, Any]) -> Dict[str, Any]:
+        """优先使用热门列表中自带的统计数据，字段缺失时才请求详情接口并补充"""
+        details = self._parse_video_stats(video)
+        stat = video.get('stat') or {}
+        if not all(field in stat for field in STAT_FIELDS):
+            # 详情接口返回的字段覆盖列表数据，请求失败时保留列表中已有的数据
+            details.update(self.get_video_details(video['bvid']))
+        return details
 
     def format_timestamp(self, timestamp: int) -> str:
         """格式化时间戳"""
@@ -232,118 +370,119 @@ class BilibiliPopularVideoAnalyzer:
             return '未知'
         return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
 
-    def format_number(self, number: Any) -> str:
-        """格式化数字显示"""
-        if number == 'N/A' or number is None:
-            return 'N/A'
-        try:
-            num = int(number)
-            return f"{num:,}"
-        except:
-            return str(number)
+    def _open_json_export(self, filename: str = None) -> Tuple[TextIO, Callable[[Dict[str, Any]], None]]:
+        """打开JSON Lines导出文件，返回文件对象和逐条写入函数"""
+        if not filename:
+            filename = f'bilibili_hot_videos_{datetime.now().strftime("%Y%m%d_%H%M%S")}.jsonl'
+
+        f = open(filename, 'w', encoding='utf-8')
+        encode = _JSON_ENCODER.encode
+
+        def write(video: Dict[str, Any]):
+            f.write(encode(video) + '\n')
 
-    def export_to_json(self, videos: List[Dict[str, Any]], filename: str = None):
-        """导出数据到JSON文件"""
+        return f, write
+
+    def _open_csv_export(self, filename: str = None) -> Tuple[TextIO, Callable[[Dict[str, Any]], None]]:
+        """打开CSV导出文件并写入表头，返回文件对象和逐条写入函数"""
         if not filename:
-            filename = f'bilibili_hot_videos_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+            filename = f'bilibili_hot_videos_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
 
+        f = open(filename, 'w', encoding='utf-8-sig', newline='')
+        writer = csv.DictWriter(f, fieldnames=CSV_EXPORT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+
+        return f, writer.writerow
+
+    def export_to_json(self, videos: Iterable[Dict[str, Any]], filename: str = None):
+        """导出数据到JSON Lines文件（每行一个视频）"""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(videos, f, ensure_ascii=False, indent=2)
-            print(f"✅ JSON数据已导出到: {filename}")
+            f, write = self._open_json_export(filename)
+            with f:
+                for video in videos:
+                    write(video)
+            print(f"✅ JSON数据已导出到: {f.name}")
         except Exception as e:
             print(f"❌ 导出JSON失败: {e}")
 
-    def export_to_csv(self, videos: List[Dict[str, Any]], filename: str = None):
+    def export_to_csv(self, videos: Iterable[Dict[str, Any]], filename: str = None):
         """导出数据到CSV文件"""
-        if not filename:
-            filename = f'bilibili_hot_videos_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-
         try:
-            if videos:
-                # 选择要导出的字段
-                export_fields = [
-                    'rank', 'title', 'owner_name', 'play_count', 'danmaku_count',
-                    'like_count', 'coin_count', 'favorite_count', 'share_count',
-                    'reply_count', 'duration_formatted', 'publish_time', 'bvid',
-                    'pub_location', 'tname'
-                ]
-
-                # 过滤数据
-                export_data = []
+            f, write = self._open_csv_export(filename)
+            with f:
                 for video in videos:
-                    export_video = {field: video.get(field, '') for field in export_fields}
-                    export_data.append(export_video)
-
-                with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=export_fields)
-                    writer.writeheader()
-                    writer.writerows(export_data)
-
-                print(f"✅ CSV数据已导出到: {filename}")
+                    write(video)
+            print(f"✅ CSV数据已导出到: {f.name}")
         except Exception as e:
             print(f"❌ 导出CSV失败: {e}")
 
     def generate_markdown_report(self, videos: List[Dict[str, Any]], filename: str = None):
         """生成Markdown格式的报告"""
+        now = datetime.now()
         if not filename:
-            filename = f'bilibili_hot_videos_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.md'
+            filename = f'bilibili_hot_videos_report_{now.strftime("%Y%m%d_%H%M%S")}.md'
 
         try:
+            # 先在列表中拼接全部内容，最后一次性写入文件
+            parts = []
+            append = parts.append
+
+            append(f"# 🎬 B站热门视频分析报告\n\n")
+            append(f"## 📋 报告信息\n")
+            append(f"- **生成时间**: {now.strftime('%Y-%m-%d %H:%M:%S')}\n")
+            append(f"- **分析视频数**: {len(videos)} 个\n\n")
+
+            # 汇总统计
+            valid_plays = [v['play_count'] for v in videos if v.get('play_count') is not None]
+            total_views = sum(valid_plays)
+            avg_views = total_views // len(valid_plays) if valid_plays else 0
+            max_views = format_number(max(valid_plays)) if valid_plays else 'N/A'
+            min_views = format_number(min(valid_plays)) if valid_plays else 'N/A'
+
+            append(f"## 📊 汇总统计\n")
+            append(f"- **总播放量**: {format_number(total_views)}\n")
+            append(f"- **平均播放量**: {format_number(avg_views)}\n")
+            append(f"- **最高播放量**: {max_views}\n")
+            append(f"- **最低播放量**: {min_views}\n\n")
+
+            # 分区统计
+            category_stats = Counter(video.get('tname', '未知分区') for video in videos)
+
+            append(f"## 🗂️ 分区分布\n")
+            for category, count in category_stats.most_common():
+                append(f"- **{category}**: {count} 个视频 ({count / len(videos) * 100:.1f}%)\n")
+            append("\n")
+
+            append(f"## 🎥 视频详情\n\n")
+            for i, video in enumerate(videos, 1):
+                append(f"""### {i}. {video['title']}
+
+**👤 UP主**: [{video['owner_name']}](https://space.bilibili.com/{video['owner_mid']})
+
+**📊 数据统计**:
+- 播放: {format_number(video.get('play_count', 'N/A'))} | 弹幕: {format_number(video.get('danmaku_count', 'N/A'))} | 点赞: {format_number(video.get('like_count', 'N/A'))}
+- 投币: {format_number(video.get('coin_count', 'N/A'))} | 收藏: {format_number(video.get('favorite_count', 'N/A'))} | 转发: {format_number(video.get('share_count', 'N/A'))}
+- 回复: {format_number(video.get('reply_count', 'N/A'))}
+
+📅 信息**:
+- 发布时间: {video.get('publish_time', '未知')}
+- 视频时长: {video.get('duration_formatted', '未知')}
+- 发布位置: {video.get('pub_location', '未知')}
+- 视频分区: {video.get('tname', '未知')}
+
+**🔗 链接**: [点击观看](https://www.bilibili.com/video/{video['bvid']})
+
+**🖼️ 封面**: ![{video['title'][:20]}]({video['pic']})
+
+""")
+
+                if video.get('desc'):
+                    append(f"**📝 简介**: {video.get('desc', '无')}\n\n")
+
+                append("---\n\n")
+
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write(f"# 🎬 B站热门视频分析报告\n\n")
-                f.write(f"## 📋 报告信息\n")
-                f.write(f"- **生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"- **分析视频数**: {len(videos)} 个\n\n")
-
-                # 汇总统计
-                valid_plays = [int(v.get('play_count', 0)) for v in videos if str(v.get('play_count', '0')).isdigit()]
-                total_views = sum(valid_plays) if valid_plays else 0
-                avg_views = total_views // len(valid_plays) if valid_plays else 0
-
-                f.write(f"## 📊 汇总统计\n")
-                f.write(f"- **总播放量**: {self.format_number(total_views)}\n")
-                f.write(f"- **平均播放量**: {self.format_number(avg_views)}\n")
-                f.write(f"- **最高播放量**: {self.format_number(max(valid_plays)) if valid_plays else 'N/A'}\n")
-                f.write(f"- **最低播放量**: {self.format_number(min(valid_plays)) if valid_plays else 'N/A'}\n\n")
-
-                # 分区统计
-                category_stats = {}
-                for video in videos:
-                    category = video.get('tname', '未知分区')
-                    category_stats[category] = category_stats.get(category, 0) + 1
-
-                f.write(f"## 🗂️ 分区分布\n")
-                for category, count in sorted(category_stats.items(), key=lambda x: x[1], reverse=True):
-                    f.write(f"- **{category}**: {count} 个视频 ({count / len(videos) * 100:.1f}%)\n")
-                f.write("\n")
-
-                f.write(f"## 🎥 视频详情\n\n")
-                for i, video in enumerate(videos, 1):
-                    f.write(f"### {i}. {video['title']}\n\n")
-                    f.write(f"**👤 UP主**: [{video['owner_name']}](https://space.bilibili.com/{video['owner_mid']})\n\n")
-                    f.write(f"**📊 数据统计**:\n")
-                    f.write(f"- 播放: {self.format_number(video.get('play_count', 'N/A'))} | ")
-                    f.write(f"弹幕: {self.format_number(video.get('danmaku_count', 'N/A'))} | ")
-                    f.write(f"点赞: {self.format_number(video.get('like_count', 'N/A'))}\n")
-                    f.write(f"- 投币: {self.format_number(video.get('coin_count', 'N/A'))} | ")
-                    f.write(f"收藏: {self.format_number(video.get('favorite_count', 'N/A'))} | ")
-                    f.write(f"转发: {self.format_number(video.get('share_count', 'N/A'))}\n")
-                    f.write(f"- 回复: {self.format_number(video.get('reply_count', 'N/A'))}\n\n")
-
-                    f.write(f"📅 信息**:\n")
-                    f.write(f"- 发布时间: {video.get('publish_time', '未知')}\n")
-                    f.write(f"- 视频时长: {video.get('duration_formatted', '未知')}\n")
-                    f.write(f"- 发布位置: {video.get('pub_location', '未知')}\n")
-                    f.write(f"- 视频分区: {video.get('tname', '未知')}\n\n")
-
-                    f.write(f"**🔗 链接**: [点击观看](https://www.bilibili.com/video/{video['bvid']})\n\n")
-                    f.write(f"**🖼️ 封面**: ![{video['title'][:20]}]({video['pic']})\n\n")
-
-                    if video.get('desc'):
-                        f.write(f"**📝 简介**: {video.get('desc', '无')}\n\n")
-
-                    f.write("---\n\n")
+                f.write(''.join(parts))
 
             print(f"✅ Markdown报告已生成: {filename}")
 
@@ -370,79 +509,114 @@ class BilibiliPopularVideoAnalyzer:
             return
 
         print(f"\n✅ 成功获取到 {len(videos)} 个热门视频")
+        print("=" * 60)
+
+        # 导出格式需在处理前确定，以便逐条写入
+        choice = self._get_export_choice()
+
         print("正在获取详细统计数据...")
         print("=" * 60)
 
-        enriched_videos = []
-
-        for i, video in enumerate(videos, 1):
-            print(f"🔍 正在处理第 {i}/{len(videos)} 个视频: {video['title'][:30]}...")
-
-            # 获取详细数据
-            details = self.get_video_details(video['bvid'])
-
-            # 合并数据
-            enriched_video = {
-                'rank': i,
-                'title': video['title'],
-                'desc': video.get('desc', ''),
-                'bvid': video['bvid'],
-                'short_link': video.get('short_link_v2', ''),
-                'pic': video.get('pic', ''),
-                'first_frame': video.get('first_frame', ''),
-                'pub_location': video.get('pub_location', ''),
-                'owner_name': video['owner']['name'],
-                'owner_mid': video['owner']['mid'],
-                'owner_face': video['owner']['face'],
-                'play_count': details.get('play_count', details.get('view', 'N/A')),
-                'danmaku_count': details.get('danmaku_count', details.get('danmaku', 'N/A')),
-                'like_count': details.get('like_count', details.get('like', 'N/A')),
-                'coin_count': details.get('coin_count', details.get('coin', 'N/A')),
-                'favorite_count': details.get('favorite_count', details.get('favorite', 'N/A')),
-                'share_count': details.get('share_count', details.get('share', 'N/A')),
-                'reply_count': details.get('reply', 'N/A'),
-                'duration': details.get('duration', 0),
-                'duration_formatted': self.format_duration(details.get('duration', 0)),
-                'publish_time': self.format_timestamp(details.get('pubdate', 0)),
-                'tname': details.get('tname', '未知'),
-                'fetch_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-
-            enriched_videos.append(enriched_video)
-
-            self._display_video_info(enriched_video, i)
-
-            # 添加延迟避免请求过快
-            time.sleep(0.3)
-
-        # 导出数据
+        # 并发获取详细数据，线程池大小即为同时在途的请求上限；
+        # JSON/CSV 在每个视频处理完后立即写入，中途出错也不会丢失已处理的数据
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor, ExitStack() as stack:
+            exports = []
+            if choice in ['1', '4']:
+                exports.append(self._start_export(stack, 'JSON', self._open_json_export))
+            if choice in ['2', '4']:
+                exports.append(self._start_export(stack, 'CSV', self._open_csv_export))
+            exports = [export for export in exports if export]
+
+            # Markdown报告需要全部数据做汇总，仅在需要时保留在内存中
+            enriched_videos = [] if choice in ['3', '4'] else None
+
+            all_details = executor.map(self._resolve_video_details, videos)
+            # 同一批数据共用一个获取时间
+            fetch_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+            for i, (video, details) in enumerate(zip(videos, all_details), 1):
+                print(f"🔍 正在处理第 {i}/{len(videos)} 个视频: {video['title'][:30]}...")
+
+                # 合并数据
+                enriched_video = {
+                    'rank': i,
+                    'title': video['title'],
+                    'desc': video.get('desc', ''),
+                    'bvid': video['bvid'],
+                    'short_link': video.get('short_link_v2', ''),
+                    'pic': video.get('pic', ''),
+                    'first_frame': video.get('first_frame', ''),
+                    'pub_location': video.get('pub_location', ''),
+                    'owner_name': video['owner']['name'],
+                    'owner_mid': video['owner']['mid'],
+                    'owner_face': video['owner']['face'],
+                    'play_count': _optional_int(details.get('play_count')),
+                    'danmaku_count': _optional_int(details.get('danmaku_count')),
+                    'like_count': _optional_int(details.get('like_count')),
+                    'coin_count': _optional_int(details.get('coin_count')),
+                    'favorite_count': _optional_int(details.get('favorite_count')),
+                    'share_count': _optional_int(details.get('share_count')),
+                    'reply_count': _optional_int(details.get('reply_count')),
+                    'duration': details.get('duration', 0),
+                    'duration_formatted': format_duration(details.get('duration', 0)),
+                    'publish_time': self.format_timestamp(details.get('pubdate', 0)),
+                    'tname': details.get('tname', '未知'),
+                    'fetch_time': fetch_time
+                }
+
+                # 某个格式写入失败时只停用该格式，不影响其余导出、缓存保存和报告生成
+                for export in list(exports):
+                    label, _, write = export
+                    try:
+                        write(enriched_video)
+                    except Exception as e:
+                        print(f"❌ 导出{label}失败: {e}")
+                        exports.remove(export)
+                if enriched_videos is not None:
+                    enriched_videos.append(enriched_video)
+
+                self._display_video_info(enriched_video, i)
+
+        self._save_cache()
+
         print("\n" + "=" * 60)
+        for label, f, write in exports:
+            print(f"✅ {label}数据已导出到: {f.name}")
+        if enriched_videos is not None:
+            self.generate_markdown_report(enriched_videos)
+
+        print("🎉 分析完成！")
+
+    def _get_export_choice(self) -> str:
+        """交互式选择导出格式"""
         print("📊 数据导出选项:")
-        print("1. JSON格式 (完整数据)")
+        print("1. JSON Lines格式 (完整数据)")
         print("2. CSV格式 (精简数据)")
         print("3. Markdown报告 (详细分析)")
         print("4. 全部导出")
         print("5. 不导出")
 
-        choice = input("请选择导出格式 (1-5): ").strip()
+        return input("请选择导出格式 (1-5): ").strip()
 
-        if choice in ['1', '4']:
-            self.export_to_json(enriched_videos)
-        if choice in ['2', '4']:
-            self.export_to_csv(enriched_videos)
-        if choice in ['3', '4']:
-            self.generate_markdown_report(enriched_videos)
-
-        print("🎉 分析完成！")
+    def _start_export(self, stack: ExitStack, label: str,
+                      opener: Callable[[], Tuple[TextIO, Callable[[Dict[str, Any]], None]]]):
+        """打开导出文件并登记到 ExitStack，失败时返回None"""
+        try:
+            f, write = opener()
+        except Exception as e:
+            print(f"❌ 导出{label}失败: {e}")
+            return None
+        stack.enter_context(f)
+        return label, f, write
 
     def _display_video_info(self, video: Dict[str, Any], rank: int):
         """显示视频信息"""
         print(f"\n【第{rank}位】{video['title']}")
         print(f"   👤 UP主: {video['owner_name']} | 📺 分区: {video.get('tname', '未知')}")
         print(
-            f"   📊 播放: {self.format_number(video['play_count'])} | 弹幕: {self.format_number(video['danmaku_count'])} | 点赞: {self.format_number(video['like_count'])}")
+            f"   📊 播放: {format_number(video['play_count'])} | 弹幕: {format_number(video['danmaku_count'])} | 点赞: {format_number(video['like_count'])}")
         print(
-            f"   🪙 投币: {self.format_number(video['coin_count'])} | 收藏: {self.format_number(video['favorite_count'])} | 转发: {self.format_number(video['share_count'])}")
+            f"   🪙 投币: {format_number(video['coin_count'])} | 收藏: {format_number(video['favorite_count'])} | 转发: {format_number(video['share_count'])}")
         print(f"   🔗 BV号: {video['bvid']}")
         print(f"   🕒 时长: {video['duration_formatted']} | 发布时间: {video['publish_time']}")
         print("-" * 60)